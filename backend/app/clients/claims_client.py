@@ -1,37 +1,87 @@
+import asyncio
+import functools
 import json
 import logging
-from typing import List, Dict, Any
+import re
+import threading
+import orjson
+from typing import List, Dict, Any, Optional
 from ..config import settings
 from .llm_client import LLMClient
 from .google_factcheck_client import CrossReferenceAdapter
-from ..prompts import CLAIM_EXTRACTION_PROMPT, STANCE_DETECTION_PROMPT, SIMILARITY_SCORING_PROMPT
+from ..prompts import CLAIM_EXTRACTION_PROMPT, STANCE_DETECTION_PROMPT, BATCH_STANCE_PROMPT, SIMILARITY_SCORING_PROMPT
 
 
 logger = logging.getLogger(__name__)
 
-_llm_client = None
-_cross_reference_adapter = None
+# Matches a markdown code fence (optionally tagged json) around the LLM's JSON output
+_FENCE_RE = re.compile(r"```(?:json)?\s*(.*?)```", re.DOTALL)
+
+# First word of a streamed stance reply, only once something follows it
+_FIRST_WORD_RE = re.compile(r"\s*[\"']?([A-Za-z_]+)[^A-Za-z_]")
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+# Approximate LLM tokens: runs of word characters, or single punctuation marks
+_TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+
+# Claims per batched stance prompt; larger batches slow the response down
+STANCE_BATCH_SIZE = 20
+
+STANCE_SCORES = {
+    "supports": 0.9,
+    "support": 0.9,
+    "refutes": 0.1,
+    "refute": 0.1,
+    "contradicts": 0.1,
+    "contradict": 0.1,
+    "neutral": 0.5,
+    "neither": 0.5,
+    "related_but_unclear": 0.4,
+    "unclear": 0.4
+}
+
+# Shared clients, built on first use; see get_llm_client()
+_llm_client: Optional[LLMClient] = None
+_cross_reference_adapter: Optional[CrossReferenceAdapter] = None
+_clients_lock = threading.Lock()
 
 def get_llm_client() -> LLMClient:
+    """Return the shared LLM client; the first callers may race from worker threads, so construction is locked."""
     global _llm_client
     if _llm_client is None:
-        _llm_client = LLMClient(
-            provider=settings.llm_provider,
-            model=settings.llm_model,
-            api_key=settings.gemini_api_key
-        )
+        with _clients_lock:
+            if _llm_client is None:
+                _llm_client = LLMClient(
+                    provider=settings.llm_provider,
+                    model=settings.llm_model,
+                    api_key=settings.gemini_api_key,
+                    cache_ttl_hours=settings.llm_cache_ttl_hours,
+                    max_concurrency=settings.llm_concurrency
+                )
     return _llm_client
 
 def get_cross_reference_adapter() -> CrossReferenceAdapter:
+    """Return the shared fact-check adapter, built once like get_llm_client()."""
     global _cross_reference_adapter
     if _cross_reference_adapter is None:
-        _cross_reference_adapter = CrossReferenceAdapter(api_key=settings.google_factcheck_api_key)
+        with _clients_lock:
+            if _cross_reference_adapter is None:
+                _cross_reference_adapter = CrossReferenceAdapter(api_key=settings.google_factcheck_api_key)
     return _cross_reference_adapter
 
-def extract_claims_and_evidence(text:str) -> Dict[str, Any]:
+async def close_clients():
+    """Release the shared clients' pooled connections (call on application shutdown)."""
+    if _cross_reference_adapter is not None:
+        await _cross_reference_adapter.aclose()
+
+async def extract_claims_and_evidence(text:str) -> Dict[str, Any]:
     """
     Main pipeline: extract claims and cross-reference against fact-checking sources.
     
+    Runs extract_claims_async(), then score_text_consistency_async() and
+    cross_reference_claims_async() concurrently.
+    
     Expected return:
     {
       "text_consistency": 0.64,
@@ -48,56 +98,97 @@ def extract_claims_and_evidence(text:str) -> Dict[str, Any]:
     }
     """
     # Step 1: Extract claims
-    claims = _extract_claims(text)
-
-    # Step 2: For each claim, compute consistency metrics
-    text_consistency_scores = []
-    for claim in claims:
-        score = _compute_text_consistency(claim["text"], text)
-        text_consistency_scores.append(score)
-    
-    avg_text_consistency = sum(text_consistency_scores) / len(text_consistency_scores) if text_consistency_scores else 0.5
+    claims = await extract_claims_async(text)
 
-    # Step 3: Cross-reference claims against fact-checking sources
-    adapter = get_cross_reference_adapter()
-    all_similarities = []
-    
-    for claim in claims:
-        evidence = adapter.cross_reference_claim(claim["text"], top_k=3)
-        claim["evidences"] = evidence
-        
-        # Collect similarity scores for aggregate cross_reference metric
-        for ev in evidence:
-            all_similarities.append(ev["similarity"])
-    
-    cross_reference = sum(all_similarities) / len(all_similarities) if all_similarities else 0.0
+    # Step 2 + 3: Compute consistency metrics and cross-reference against
+    # fact-checking sources; the two are independent, so run them together
+    text_consistency, cross_reference = await asyncio.gather(
+        score_text_consistency_async(claims, text),
+        cross_reference_claims_async(claims),
+    )
     
     return {
-        "text_consistency": avg_text_consistency,
+        "text_consistency": text_consistency,
         "cross_reference": cross_reference,
         "claims": claims
     }
 
-def _extract_claims(text: str) -> List[Dict[str, Any]]:
-    max_chars = 4000
-    if len(text) > max_chars:
-        text = text[:max_chars]
+async def extract_claims_async(text: str) -> List[Dict[str, Any]]:
+    """Extract the claims in an article; each claim's "evidences" list starts out empty."""
+    text = _truncate_to_tokens(text, settings.claim_extraction_max_tokens)
     
     prompt = CLAIM_EXTRACTION_PROMPT.format(text=text)
     
-    result = get_llm_client().call(prompt, temperature=0.2, max_tokens=1000)
+    result = await get_llm_client().acall(prompt, temperature=0.2, max_tokens=1000)
+    return _parse_claims(result, text)
+
+async def score_text_consistency_async(claims: List[Dict[str, Any]], text: str) -> float:
+    """
+    Average stance score of the claims against the article text (0.5 if there are none).
+    
+    Each distinct claim is scored once, in batched LLM calls; LLMClient.acall()
+    caps how many run at once.
+    """
+    # The same assertion often appears several times in an article; only
+    # score each distinct claim once
+    unique_claims = _group_claims(claims)
+    claim_texts = [group[0]["text"] for group in unique_claims.values()]
+
+    batches = [claim_texts[i:i + STANCE_BATCH_SIZE] for i in range(0, len(claim_texts), STANCE_BATCH_SIZE)]
+    batch_scores = await asyncio.gather(*[_compute_text_consistency_batch_async(batch, text) for batch in batches])
+    unique_scores = [score for scores in batch_scores for score in scores]
+
+    # Every duplicate counts towards the average
+    text_consistency_scores = [score for group, score in zip(unique_claims.values(), unique_scores) for _ in group]
+    return sum(text_consistency_scores) / len(text_consistency_scores) if text_consistency_scores else 0.5
+
+async def cross_reference_claims_async(claims: List[Dict[str, Any]], top_k: int = 3) -> float:
+    """
+    Look up fact-checks for the claims, filling in each claim's "evidences" list.
+    
+    Each distinct claim is searched once; the searches run concurrently, with
+    in-flight requests and request rate capped by the fact-check client.
+    Returns the mean similarity over all evidence (0.0 if none was found).
+    """
+    unique_claims = _group_claims(claims)
+    claim_texts = [group[0]["text"] for group in unique_claims.values()]
+
+    evidences = await get_cross_reference_adapter().cross_reference_claims_batch(claim_texts, top_k=top_k)
+
+    # Fan the per-claim results back out to every duplicate
+    all_similarities = []
+    for group, evidence in zip(unique_claims.values(), evidences):
+        for claim in group:
+            claim["evidences"] = evidence
+            
+            # Collect similarity scores for aggregate cross_reference metric
+            all_similarities.extend(ev["similarity"] for ev in evidence)
+    
+    return sum(all_similarities) / len(all_similarities) if all_similarities else 0.0
+
+def _group_claims(claims: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+    """Group claims by normalized text, in order of first appearance."""
+    unique_claims: Dict[str, List[Dict[str, Any]]] = {}
+    for claim in claims:
+        unique_claims.setdefault(_normalize_claim(claim["text"]), []).append(claim)
+    return unique_claims
+
+def _normalize_claim(claim_text: str) -> str:
+    """Canonical form used to detect duplicate claims (case and whitespace insensitive)."""
+    return _WHITESPACE_RE.sub(" ", claim_text.strip().lower())
+
+def _parse_claims(result: Dict[str, Any], text: str) -> List[Dict[str, Any]]:
+    """Parse a claim-extraction reply, locating each claim in the (truncated) text."""
     response_text = result["response"].strip()
     
     logger.info(f"Claim extraction latency: {result['latency_ms']:.0f}ms")
     logger.debug(f"Claim extraction response: {response_text[:500]}")
 
     try:
-        if "```" in response_text:
-            response_text = response_text.split("```")[1]
-            if response_text.startswith("json"):
-                response_text = response_text[4:]
+        claims_data = orjson.loads(_strip_code_fence(response_text))
         
-        claims_data = json.loads(response_text)
+        # Lowercase the article once for the case-insensitive position search below
+        text_lower = text.lower()
         
         claims = []
         for item in claims_data:
@@ -116,7 +207,6 @@ def _extract_claims(text: str) -> List[Dict[str, Any]]:
                     else:
                         # Search for claim text in original text (case-insensitive)
                         search_text = claim_text.lower()
-                        text_lower = text.lower()
                         pos = text_lower.find(search_text)
                         if pos != -1:
                             start_char = pos
@@ -132,29 +222,88 @@ def _extract_claims(text: str) -> List[Dict[str, Any]]:
         logger.info(f"Extracted {len(claims)} claims")
         return claims
         
-    except json.JSONDecodeError as e:
+    except orjson.JSONDecodeError as e:
         logger.error(f"Failed to parse claim extraction response: {e}")
         logger.error(f"Response was: {response_text}")
         return []
 
-def _compute_text_consistency(claim: str, text: str) -> float:
-    prompt = STANCE_DETECTION_PROMPT.format(claim=claim, evidence=text[:2000])
+async def _compute_text_consistency_async(claim: str, text: str) -> float:
+    prompt = STANCE_DETECTION_PROMPT.format(claim=claim, evidence=_truncate_to_tokens(text, settings.stance_evidence_max_tokens))
     
-    result = get_llm_client().call(prompt, temperature=0.1, max_tokens=100)
-    response_text = result["response"].strip().lower()
+    result = await get_llm_client().acall(prompt, temperature=0.1, max_tokens=20, stop_when=_stance_is_decided)
+    return _stance_to_score(result["response"])
+
+def _stance_is_decided(partial_response: str) -> bool:
+    """True once the reply's first word is complete and is a known stance."""
+    match = _FIRST_WORD_RE.match(partial_response)
+    return bool(match) and match.group(1).lower() in STANCE_SCORES
+
+async def _compute_text_consistency_batch_async(claims: List[str], text: str) -> List[float]:
+    """
+    Score the stance of several claims against the same text with a single LLM call.
     
-    stance_scores = {
-        "supports": 0.9,
-        "support": 0.9,
-        "refutes": 0.1,
-        "refute": 0.1,
-        "neutral": 0.5,
-        "related_but_unclear": 0.4,
-        "unclear": 0.4
-    }
+    Claims missing from the batched response (or all of them, if the response is not
+    valid JSON) fall back to one stance call per claim.
+    """
+    prompt = BATCH_STANCE_PROMPT.format(
+        claims=json.dumps(claims), evidence=_truncate_to_tokens(text, settings.stance_evidence_max_tokens)
+    )
+    
+    result = await get_llm_client().acall(prompt, temperature=0.1, max_tokens=50 * len(claims))
+    response_text = result["response"].strip()
+    
+    scores: List[Optional[float]] = [None] * len(claims)
+    try:
+        for item in orjson.loads(_strip_code_fence(response_text)):
+            if not isinstance(item, dict):
+                continue
+            claim_id = item.get("claim_id")
+            if isinstance(claim_id, int) and 0 <= claim_id < len(claims):
+                scores[claim_id] = _stance_to_score(str(item.get("stance", "")))
+    except (orjson.JSONDecodeError, TypeError) as e:
+        logger.warning(f"Failed to parse batch stance response: {e}")
+    
+    missing = [i for i, score in enumerate(scores) if score is None]
+    if missing:
+        logger.info(f"Falling back to per-claim stance detection for {len(missing)} claims")
+        fallback = await asyncio.gather(*[_compute_text_consistency_async(claims[i], text) for i in missing])
+        for i, score in zip(missing, fallback):
+            scores[i] = score
+    return scores
+
+@functools.lru_cache(maxsize=8)
+def _truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """
+    Cut text after roughly max_tokens tokens, on a token boundary.
+    
+    Words and punctuation marks are counted as one token each; this is an
+    approximation, not Gemini's tokenizer. Text is first capped at
+    4 * max_tokens characters, so input without spaces (CJK, minified code,
+    long URLs) is still bounded. Cached because every stance prompt for an
+    article truncates the same text.
+    """
+    text = text[:4 * max_tokens]
+    for count, match in enumerate(_TOKEN_RE.finditer(text), start=1):
+        if count == max_tokens:
+            return text[:match.end()]
+    return text
+
+def _strip_code_fence(response_text: str) -> str:
+    match = _FENCE_RE.search(response_text)
+    return match.group(1) if match else response_text
+
+def _stance_to_score(response_text: str) -> float:
+    response_text = response_text.strip().lower()
+    
+    # Stance replies are usually a single word, so look up the first token directly
+    tokens = response_text.split(None, 1)
+    if tokens:
+        score = STANCE_SCORES.get(tokens[0].strip("\"'.,!"))
+        if score is not None:
+            return score
     
-    # Try to find matching stance keyword
-    for stance_keyword, score in stance_scores.items():
+    # Otherwise try to find a matching stance keyword anywhere in the response
+    for stance_keyword, score in STANCE_SCORES.items():
         if stance_keyword in response_text:
             return score
         
@@ -1,100 +1,116 @@
+import asyncio
 import logging
-import requests
+import httpx
 import hashlib
 import json
+import orjson
+import re
 from pathlib import Path
-from typing import List, Dict, Any, Optional
-from datetime import datetime, timedelta
+from typing import List, Dict, Any, Optional, Tuple
+from datetime import timedelta
 import time
 import os
+import sqlite3
+import threading
+from rapidfuzz import fuzz, process, utils
+from .rate_limit import AsyncTokenBucket
+from .http_pool import LoopBoundAsyncClient, USER_AGENT
 
 logger = logging.getLogger(__name__)
 
 
+def _sorted_words(text: str) -> List[str]:
+    """Normalize text into its words in sorted order, for order-insensitive word matching."""
+    return sorted(utils.default_process(text).split())
+
+
 class ResultCache:
     """
-    File-based cache for fact-check results with TTL support.
+    SQLite-backed cache for fact-check results with TTL support.
+    
+    All entries live in a single database file, so a lookup is one indexed
+    read instead of a file open per claim, and expired entries are evicted
+    with a single range delete.
     """
     
-    def __init__(self, cache_dir: str = "./cache/fact_checks", ttl_hours: int = 168):
+    def __init__(self, db_path: str = "./cache/fact_checks.db", ttl_hours: int = 168):
         """
         Initialize cache.
         
         Args:
-            cache_dir: Directory to store cache files
+            db_path: Path of the SQLite database file
             ttl_hours: Time-to-live in hours (default: 7 days)
         """
-        self.cache_dir = Path(cache_dir)
-        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
         self.ttl = timedelta(hours=ttl_hours)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS fact_checks ("
+            "key TEXT PRIMARY KEY, stored_at REAL NOT NULL, results TEXT NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ix_fact_checks_stored_at ON fact_checks (stored_at)")
+        self.evict_expired()
     
-    def _get_cache_key(self, claim: str) -> str:
-        """Generate cache key from claim text."""
-        return hashlib.md5(claim.lower().encode()).hexdigest()
-    
-    def _get_cache_path(self, cache_key: str) -> Path:
-        """Get file path for cache key."""
-        return self.cache_dir / f"{cache_key}.json"
+    def get_cache_key(self, claim: str, publisher_filter: Optional[str] = None) -> str:
+        """Generate cache key from claim text and publisher filter."""
+        # Hash the parts incrementally rather than building a combined string first
+        digest = hashlib.blake2b(claim.lower().encode(), digest_size=16)
+        digest.update(b"|")
+        digest.update((publisher_filter or "all").lower().encode())
+        return digest.hexdigest()
     
-    def get(self, claim: str) -> Optional[List[Dict[str, Any]]]:
+    def get(self, cache_key: str) -> Optional[List[Dict[str, Any]]]:
         """
-        Retrieve cached results for a claim.
+        Retrieve cached results.
         
         Args:
-            claim: The claim text
+            cache_key: Key from get_cache_key()
             
         Returns:
             Cached results or None if not found/expired
         """
-        cache_key = self._get_cache_key(claim)
-        cache_path = self._get_cache_path(cache_key)
-        
-        if not cache_path.exists():
-            return None
-        
         try:
-            with open(cache_path, 'r', encoding='utf-8') as f:
-                cached_data = json.load(f)
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT results FROM fact_checks WHERE key = ? AND stored_at >= ?",
+                    (cache_key, time.time() - self.ttl.total_seconds())
+                ).fetchone()
             
-            # Check if expired
-            cached_time = datetime.fromisoformat(cached_data["timestamp"])
-            if datetime.now() - cached_time > self.ttl:
-                logger.info(f"Cache expired for claim: {claim[:50]}...")
-                cache_path.unlink()
-                return None
-            
-            logger.info(f"Cache hit for claim: {claim[:50]}...")
-            return cached_data["results"]
+            return json.loads(row[0]) if row else None
             
         except Exception as e:
             logger.warning(f"Failed to read cache: {str(e)}")
             return None
     
-    def set(self, claim: str, results: List[Dict[str, Any]]):
+    def set(self, cache_key: str, results: List[Dict[str, Any]]):
         """
         Store results in cache.
         
         Args:
-            claim: The claim text
+            cache_key: Key from get_cache_key()
             results: List of fact-check results
         """
-        cache_key = self._get_cache_key(claim)
-        cache_path = self._get_cache_path(cache_key)
-        
         try:
-            cached_data = {
-                "timestamp": datetime.now().isoformat(),
-                "claim": claim,
-                "results": results
-            }
-            
-            with open(cache_path, 'w', encoding='utf-8') as f:
-                json.dump(cached_data, f, indent=2)
-            
-            logger.info(f"Cached {len(results)} results for claim: {claim[:50]}...")
+            payload = json.dumps(results, separators=(',', ':'))
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO fact_checks (key, stored_at, results) VALUES (?, ?, ?)",
+                    (cache_key, time.time(), payload)
+                )
             
         except Exception as e:
             logger.warning(f"Failed to write cache: {str(e)}")
+    
+    def evict_expired(self):
+        """Delete all entries older than the TTL."""
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM fact_checks WHERE stored_at < ?",
+                (time.time() - self.ttl.total_seconds(),)
+            )
 
 
 class GoogleFactCheckClient:
@@ -105,22 +121,71 @@ class GoogleFactCheckClient:
     
     BASE_URL = "https://factchecktools.googleapis.com/v1alpha1/claims:search"
     
-    def __init__(self, api_key: str, rate_limit_delay: float = 1.0, use_cache: bool = True):
+    # Map common ratings to scores
+    RATING_MAP = {
+        # True ratings
+        "true": 0.95,
+        "correct": 0.95,
+        "accurate": 0.95,
+        "mostly true": 0.75,
+        "mostly correct": 0.75,
+        
+        # Mixed ratings
+        "half true": 0.5,
+        "mixture": 0.5,
+        "mixed": 0.5,
+        "unproven": 0.4,
+        "undetermined": 0.4,
+        
+        # False ratings
+        "mostly false": 0.25,
+        "mostly incorrect": 0.25,
+        "false": 0.05,
+        "incorrect": 0.05,
+        "pants on fire": 0.0,
+        "pants fire": 0.0,  # PolitiFact slug "pants-fire"
+        
+        # Special cases
+        "legend": 0.05,  # Snopes legend = false
+        "outdated": 0.3,
+        "misleading": 0.2
+    }
+    
+    # Finds the leftmost rating phrase in one scan; longer keys are tried first at
+    # each position so "mostly false" wins over "false"
+    _RATING_RE = re.compile("|".join(re.escape(key) for key in sorted(RATING_MAP, key=len, reverse=True)))
+    
+    HEADERS = {"User-Agent": USER_AGENT}
+    TIMEOUT = 15
+    
+    # Sized for a whole article's claims being searched concurrently
+    LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=32)
+    
+    def __init__(
+        self,
+        api_key: str,
+        rate_limit_delay: float = 1.0,
+        rate_limit_burst: int = 5,
+        max_concurrency: int = 8,
+        use_cache: bool = True
+    ):
         """
         Initialize Google Fact Check client.
         
         Args:
             api_key: Google Cloud API key with Fact Check Tools API enabled
-            rate_limit_delay: Delay in seconds between API calls
-            use_cache: Whether to use file-based caching
+            rate_limit_delay: Delay in seconds between API calls (sustained rate)
+            rate_limit_burst: Number of async calls allowed back to back before pacing kicks in
+            max_concurrency: Maximum number of in-flight requests in search_many()
+            use_cache: Whether to use SQLite-backed caching
         """
         self.api_key = api_key
         self.rate_limit_delay = rate_limit_delay
         self.last_request_time = 0
-        self.session = requests.Session()
-        self.session.headers.update({
-            "User-Agent": "FakeNewsDetectionAI/1.0"
-        })
+        self.rate_limiter = AsyncTokenBucket(capacity=rate_limit_burst, refill_per_sec=1.0 / rate_limit_delay)
+        self.max_concurrency = max_concurrency
+        self.http = httpx.Client(http2=True, limits=self.LIMITS, timeout=self.TIMEOUT, headers=self.HEADERS)
+        self._async_http = LoopBoundAsyncClient(http2=True, limits=self.LIMITS, timeout=self.TIMEOUT, headers=self.HEADERS)
         self.cache = ResultCache() if use_cache else None
     
     def search(
@@ -156,55 +221,127 @@ class GoogleFactCheckClient:
             ]
         """
         # Check cache first
-        if self.cache:
-            cache_key = f"{claim}|{publisher_filter or 'all'}"
+        cache_key = self.cache.get_cache_key(claim, publisher_filter) if self.cache else None
+        if cache_key:
             cached_results = self.cache.get(cache_key)
             if cached_results is not None:
+                logger.info(f"Cache hit for claim: {claim[:50]}...")
                 return cached_results[:limit]
         
         self._respect_rate_limit()
         
         try:
-            params = {
-                "query": claim,
-                "pageSize": min(limit, 100),  # API max is 100
-                "languageCode": language,
-                "key": self.api_key
-            }
-            
-            if publisher_filter:
-                params["reviewPublisherSiteFilter"] = publisher_filter
-            
             logger.info(f"Searching Google Fact Check API for: {claim[:50]}...")
-            response = self.session.get(self.BASE_URL, params=params, timeout=15)
+            response = self.http.get(self.BASE_URL, params=self._build_params(claim, limit, language, publisher_filter))
             response.raise_for_status()
-            
-            data = response.json()
-            results = []
-            
-            # Parse the results
-            for claim_data in data.get("claims", []):
-                result = self._parse_claim(claim_data)
-                if result:
-                    results.append(result)
-            
-            logger.info(f"Found {len(results)} fact-check results")
-            
-            # Cache the results
-            if self.cache:
+            results = self._parse_response(orjson.loads(response.content))
+            if cache_key:
                 self.cache.set(cache_key, results)
+            return results[:limit]
             
+        except httpx.HTTPError as e:
+            self._log_http_error(e)
+            return []
+        except Exception as e:
+            logger.error(f"Error parsing Google Fact Check response: {str(e)}")
+            return []
+    
+    async def search_async(
+        self,
+        claim: str,
+        limit: int = 10,
+        language: str = "en",
+        publisher_filter: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Async variant of search(); see search() for arguments and return value."""
+        # Check cache first
+        cache_key = self.cache.get_cache_key(claim, publisher_filter) if self.cache else None
+        if cache_key:
+            # SQLite I/O, so keep it off the event loop
+            cached_results = await asyncio.to_thread(self.cache.get, cache_key)
+            if cached_results is not None:
+                logger.info(f"Cache hit for claim: {claim[:50]}...")
+                return cached_results[:limit]
+        
+        await self.rate_limiter.acquire()
+        
+        try:
+            logger.info(f"Searching Google Fact Check API for: {claim[:50]}...")
+            http = await self._async_http.get()
+            response = await http.get(
+                self.BASE_URL, params=self._build_params(claim, limit, language, publisher_filter)
+            )
+            response.raise_for_status()
+            results = self._parse_response(orjson.loads(response.content))
+            if cache_key:
+                await asyncio.to_thread(self.cache.set, cache_key, results)
             return results[:limit]
             
-        except requests.RequestException as e:
-            logger.error(f"Google Fact Check API error: {str(e)}")
-            if hasattr(e.response, 'text'):
-                logger.error(f"Response: {e.response.text[:500]}")
+        except httpx.HTTPError as e:
+            self._log_http_error(e)
             return []
         except Exception as e:
             logger.error(f"Error parsing Google Fact Check response: {str(e)}")
             return []
     
+    async def search_many(
+        self,
+        claims: List[str],
+        limit: int = 10,
+        language: str = "en",
+        publisher_filter: Optional[str] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Search for fact-checks for several claims concurrently.
+        
+        Requests share the client's rate limiter and at most max_concurrency are
+        in flight at once. Returns one result list per claim, in input order.
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        
+        async def search_one(claim: str) -> List[Dict[str, Any]]:
+            async with semaphore:
+                return await self.search_async(claim, limit, language, publisher_filter)
+        
+        return await asyncio.gather(*[search_one(claim) for claim in claims])
+    
+    async def aclose(self):
+        """Close the pooled async HTTP client (call on application shutdown)."""
+        await self._async_http.aclose()
+    
+    def _build_params(self, claim: str, limit: int, language: str, publisher_filter: Optional[str]) -> Dict[str, Any]:
+        """Build query parameters for a claims:search request."""
+        params = {
+            "query": claim,
+            "pageSize": min(limit, 100),  # API max is 100
+            "languageCode": language,
+            "key": self.api_key
+        }
+        
+        if publisher_filter:
+            params["reviewPublisherSiteFilter"] = publisher_filter
+        
+        return params
+    
+    def _parse_response(self, data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Parse a claims:search response body into fact-check results."""
+        results = []
+        
+        # Parse the results
+        for claim_data in data.get("claims", []):
+            result = self._parse_claim(claim_data)
+            if result:
+                results.append(result)
+        
+        logger.info(f"Found {len(results)} fact-check results")
+        
+        return results
+    
+    def _log_http_error(self, e: httpx.HTTPError):
+        logger.error(f"Google Fact Check API error: {str(e)}")
+        if isinstance(e, httpx.HTTPStatusError):
+            logger.error(f"Response: {e.response.text[:500]}")
+    
     def _parse_claim(self, claim_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Parse a single claim from Google Fact Check API response."""
         try:
@@ -241,46 +378,17 @@ class GoogleFactCheckClient:
         Convert textual rating to numeric score (0-1).
         Handles various rating formats from different fact-checkers.
         """
-        rating = rating.lower().strip()
-        
-        # Map common ratings to scores
-        rating_map = {
-            # True ratings
-            "true": 0.95,
-            "correct": 0.95,
-            "accurate": 0.95,
-            "mostly true": 0.75,
-            "mostly correct": 0.75,
-            
-            # Mixed ratings
-            "half true": 0.5,
-            "mixture": 0.5,
-            "mixed": 0.5,
-            "unproven": 0.4,
-            "undetermined": 0.4,
-            
-            # False ratings
-            "mostly false": 0.25,
-            "mostly incorrect": 0.25,
-            "false": 0.05,
-            "incorrect": 0.05,
-            "pants on fire": 0.0,
-            "pants-fire": 0.0,
-            
-            # Special cases
-            "legend": 0.05,  # Snopes legend = false
-            "outdated": 0.3,
-            "misleading": 0.2
-        }
+        # Hyphenated ratings ("Half-true", "mostly-false") match their spaced keys
+        rating = rating.lower().strip().replace("-", " ")
         
         # Try exact match first
-        if rating in rating_map:
-            return rating_map[rating]
+        if rating in self.RATING_MAP:
+            return self.RATING_MAP[rating]
         
         # Try partial matches
-        for key, value in rating_map.items():
-            if key in rating:
-                return value
+        match = self._RATING_RE.search(rating)
+        if match:
+            return self.RATING_MAP[match.group(0)]
         
         # Default to uncertain
         return 0.5
@@ -299,6 +407,13 @@ class CrossReferenceAdapter:
     Handles semantic similarity matching and result ranking.
     """
     
+    # Fact-checks scoring below this similarity are treated as unrelated; unrelated
+    # fact-check statements average about 0.08 and rarely reach 0.3
+    MIN_SIMILARITY = 0.3
+    
+    # Statements more than ~3x longer or shorter than the claim are never close matches
+    MIN_LENGTH_RATIO = 0.3
+    
     def __init__(self, api_key: Optional[str] = None):
         """
         Initialize cross-reference adapter.
@@ -344,20 +459,40 @@ class CrossReferenceAdapter:
         
         # Search Google Fact Check API
         results = self.client.search(claim, limit=20)
+        return self._to_evidence(claim, results, top_k)
+    
+    async def cross_reference_claims_batch(self, claims: List[str], top_k: int = 5) -> List[List[Dict[str, Any]]]:
+        """
+        Cross-reference several claims in one concurrent wave of searches.
         
+        Returns one evidence list per claim, in input order; see cross_reference_claim()
+        for the evidence format.
+        """
+        if self.client is None:
+            logger.warning("Cross-referencing disabled: no API key")
+            return [[] for _ in claims]
+        
+        all_results = await self.client.search_many(claims, limit=20)
+        return [self._to_evidence(claim, results, top_k) for claim, results in zip(claims, all_results)]
+    
+    async def aclose(self):
+        """Close the fact-check client's pooled connections (call on application shutdown)."""
+        if self.client is not None:
+            await self.client.aclose()
+    
+    def _to_evidence(self, claim: str, results: List[Dict[str, Any]], top_k: int) -> List[Dict[str, Any]]:
+        """Rank search results against the claim and convert the best ones to evidence items."""
         if not results:
             logger.info(f"No fact-checks found for claim: {claim[:50]}...")
             return []
         
-        # Convert to evidence format and compute similarity
+        # Rank all candidates against the claim in one call, dropping weak matches
+        ranked = self._rank_by_similarity(claim, [result["statement"] for result in results], top_k)
+        
+        # Convert to evidence format
         evidence_list = []
-        for result in results:
-            similarity = self._compute_similarity(claim, result["statement"])
-            
-            # Only include results with reasonable similarity
-            if similarity < 0.15:
-                continue
-            
+        for index, similarity in ranked:
+            result = results[index]
             evidence = {
                 "type": "fact_check",
                 "source_name": result["publisher"],
@@ -370,72 +505,43 @@ class CrossReferenceAdapter:
             }
             evidence_list.append(evidence)
         
-        # Sort by similarity (descending)
-        evidence_list.sort(key=lambda x: x["similarity"], reverse=True)
-        
         logger.info(f"Cross-referenced claim: found {len(evidence_list)} relevant fact-checks")
-        return evidence_list[:top_k]
+        return evidence_list
     
-    def _compute_similarity(self, text1: str, text2: str) -> float:
-        """
-        Compute semantic similarity using multiple methods.
-        
-        Combines:
-        - Jaccard similarity (word overlap)
-        - Character-level fuzzy matching
-        - Substring matching
-        
-        Returns score between 0 and 1.
+    def _rank_by_similarity(self, claim: str, statements: List[str], top_k: int) -> List[Tuple[int, float]]:
         """
-        if not text1 or not text2:
-            return 0.0
-        
-        # Normalize texts
-        t1 = text1.lower().strip()
-        t2 = text2.lower().strip()
-        
-        # Method 1: Jaccard similarity (word-level)
-        words1 = set(t1.split())
-        words2 = set(t2.split())
-        
-        intersection = len(words1 & words2)
-        union = len(words1 | words2)
-        jaccard = intersection / union if union > 0 else 0.0
-        
-        # Method 2: Character-level fuzzy matching
-        fuzzy_score = self._fuzzy_ratio(t1, t2)
-        
-        # Method 3: Substring bonus
-        substring_bonus = 0.0
-        shorter = min(t1, t2, key=len)
-        longer = max(t1, t2, key=len)
-        if len(shorter) > 20 and shorter in longer:
-            substring_bonus = 0.2
+        Rank candidate statements by semantic similarity to the claim.
         
-        # Weighted combination
-        similarity = (0.6 * jaccard) + (0.3 * fuzzy_score) + substring_bonus
+        Uses rapidfuzz's Indel ratio over each text's sorted words, so word order
+        doesn't matter but there is no partial (substring) matching that would let
+        unrelated statements sharing common words score high. The whole candidate
+        list is scored in a single C++ call. Candidates whose length is too far from the claim's
+        (MIN_LENGTH_RATIO) are skipped without scoring, and candidates below
+        MIN_SIMILARITY are dropped.
         
-        return min(similarity, 1.0)
-    
-    def _fuzzy_ratio(self, s1: str, s2: str) -> float:
-        """
-        Simple character-level fuzzy matching.
-        For production, consider using python-Levenshtein or rapidfuzz.
+        Returns up to top_k (index, similarity) pairs sorted by similarity
+        (descending), with similarity between 0 and 1.
         """
-        # Character bigram similarity
-        def bigrams(s):
-            return set(s[i:i+2] for i in range(len(s)-1))
-        
-        bg1 = bigrams(s1)
-        bg2 = bigrams(s2)
-        
-        if not bg1 or not bg2:
-            return 0.0
+        if not claim:
+            return []
         
-        intersection = len(bg1 & bg2)
-        union = len(bg1 | bg2)
+        # Cheap length prefilter before any fuzzy scoring
+        claim_len = len(claim)
+        candidates = {
+            index: statement
+            for index, statement in enumerate(statements)
+            if statement and min(claim_len, len(statement)) / max(claim_len, len(statement)) >= self.MIN_LENGTH_RATIO
+        }
         
-        return intersection / union if union > 0 else 0.0
+        matches = process.extract(
+            claim,
+            candidates,
+            scorer=fuzz.ratio,
+            processor=_sorted_words,
+            score_cutoff=self.MIN_SIMILARITY * 100,
+            limit=top_k
+        )
+        return [(index, score / 100.0) for _, score, index in matches]
     
     def _score_to_stance(self, truth_score: float) -> str:
         """
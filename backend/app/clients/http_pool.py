@@ -0,0 +1,56 @@
+import asyncio
+import logging
+from typing import Optional
+import httpx
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = "FakeNewsDetectionAI/1.0"
+
+
+class LoopBoundAsyncClient:
+    """
+    Lazily created httpx.AsyncClient that follows the running event loop.
+    
+    Pooled connections are tied to the loop that opened them, so the client is
+    recreated when used from a different loop (e.g. a new asyncio.run), and the
+    client it replaces is closed instead of being leaked.
+    """
+    
+    def __init__(self, **client_kwargs):
+        """
+        Args:
+            client_kwargs: Keyword arguments for httpx.AsyncClient; the
+                User-Agent header defaults to USER_AGENT
+        """
+        client_kwargs.setdefault("headers", {"User-Agent": USER_AGENT})
+        self._client_kwargs = client_kwargs
+        self._client: Optional[httpx.AsyncClient] = None
+        self._loop = None
+    
+    async def get(self) -> httpx.AsyncClient:
+        """Return the client for the running event loop, creating it if needed."""
+        loop = asyncio.get_running_loop()
+        client = self._client
+        if client is None or self._loop is not loop:
+            # Swap before awaiting, so concurrent callers all get the new client
+            stale = client
+            client = self._client = httpx.AsyncClient(**self._client_kwargs)
+            self._loop = loop
+            if stale is not None:
+                await self._close_quietly(stale)
+        return client
+    
+    async def aclose(self):
+        """Close the current client, if any (call on application shutdown)."""
+        client, self._client, self._loop = self._client, None, None
+        if client is not None:
+            await self._close_quietly(client)
+    
+    @staticmethod
+    async def _close_quietly(client: httpx.AsyncClient):
+        try:
+            await client.aclose()
+        except Exception as e:
+            # Connections opened on a loop that has since been closed can't be shut down cleanly
+            logger.debug(f"Failed to close HTTP client: {str(e)}")
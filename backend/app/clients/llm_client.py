@@ -1,39 +1,274 @@
 import os
 import json
+import asyncio
+import atexit
+import hashlib
 import logging
+import queue
+import tempfile
+import threading
 import time
-from typing import Dict, Any, List
-from datetime import datetime
+from collections import OrderedDict
+from typing import Callable, Dict, Any, List, Optional
+from datetime import datetime, timedelta
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
+
+class CallLogWriter:
+    """
+    Appends JSON lines to a log file from a background thread.
+    
+    write() only enqueues the entry, so callers never block on file I/O. The
+    writer thread drains the queue in batches of up to `batch_size` entries or
+    every `flush_interval` seconds, with one write and flush per batch.
+    """
+    
+    _STOP = object()
+    
+    def __init__(self, path: Path, batch_size: int = 64, flush_interval: float = 0.5):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue = queue.SimpleQueue()
+        self._thread = None
+        self._start_lock = threading.Lock()
+    
+    def write(self, entry: Dict[str, Any]):
+        """Queue an entry to be appended to the log file."""
+        if self._thread is None:
+            self._start()
+        self._queue.put(entry)
+    
+    def close(self, timeout: float = 2.0):
+        """Flush queued entries and stop the writer thread."""
+        if self._thread is not None:
+            self._queue.put(self._STOP)
+            self._thread.join(timeout)
+    
+    def _start(self):
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="llm-call-log", daemon=True)
+                self._thread.start()
+                atexit.register(self.close)
+    
+    def _run(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a", buffering=1 << 16) as f:
+            while True:
+                batch = [self._queue.get()]
+                deadline = time.monotonic() + self.flush_interval
+                while len(batch) < self.batch_size and batch[-1] is not self._STOP:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(self._queue.get(timeout=remaining))
+                    except queue.Empty:
+                        break
+                
+                stop = batch[-1] is self._STOP
+                if stop:
+                    batch.pop()
+                if batch:
+                    f.write("".join(json.dumps(entry) + "\n" for entry in batch))
+                    f.flush()
+                if stop:
+                    return
+
+
+_call_log_writer = CallLogWriter(Path("./logs") / "llm_calls.jsonl")
+
+_genai_lock = threading.Lock()
+_genai_api_key = object()  # sentinel: SDK not configured yet
+
+
+def _configure_genai(api_key: str):
+    """
+    Import and configure the google.generativeai SDK.
+    
+    genai.configure() sets process-global state, so it only runs again when the
+    API key changes instead of on every LLMClient construction.
+    """
+    global _genai_api_key
+    import google.generativeai as genai
+    
+    with _genai_lock:
+        if _genai_api_key != api_key:
+            genai.configure(api_key=api_key)
+            _genai_api_key = api_key
+    return genai
+
+
+class LLMResponseCache:
+    """
+    Cache for LLM responses keyed by prompt hash.
+    
+    An in-process LRU sits in front of a file-based store with TTL support,
+    so repeated prompts are also reused across processes and restarts.
+    """
+    
+    def __init__(self, cache_dir: str = "./cache/llm", ttl_hours: int = 24, maxsize: int = 2048):
+        """
+        Initialize cache.
+        
+        Args:
+            cache_dir: Directory to store cache files
+            ttl_hours: Time-to-live in hours (default: 1 day)
+            maxsize: Maximum number of responses kept in memory
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.ttl = timedelta(hours=ttl_hours)
+        self.maxsize = maxsize
+        self._memory: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get_cache_key(self, model: str, prompt: str, temperature: float, max_tokens: int, streamed: bool = False) -> str:
+        """Generate cache key from the prompt and the generation settings."""
+        digest = hashlib.blake2b(prompt.encode(), digest_size=16)
+        digest.update(f"|{model}|{temperature}|{max_tokens}|{streamed}".encode())
+        return digest.hexdigest()
+    
+    def _get_cache_path(self, cache_key: str) -> Path:
+        """Get file path for cache key."""
+        return self.cache_dir / f"{cache_key}.json"
+    
+    def get(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """
+        Retrieve a cached response.
+        
+        Args:
+            cache_key: Key from get_cache_key()
+            
+        Returns:
+            Cached result or None if not found/expired
+        """
+        with self._lock:
+            entry = self._memory.get(cache_key)
+            if entry is not None:
+                stored_at, result = entry
+                if time.time() - stored_at <= self.ttl.total_seconds():
+                    self._memory.move_to_end(cache_key)
+                    return result
+                del self._memory[cache_key]
+        
+        cache_path = self._get_cache_path(cache_key)
+        
+        try:
+            # Expiry is based on the file's mtime, so the payload is only parsed on a hit
+            stored_at = cache_path.stat().st_mtime
+            if time.time() - stored_at > self.ttl.total_seconds():
+                cache_path.unlink()
+                return None
+            
+            with open(cache_path, 'rb') as f:
+                result = json.loads(f.read())
+            
+            self._remember(cache_key, result, stored_at)
+            return result
+            
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Failed to read LLM cache: {str(e)}")
+            return None
+    
+    def set(self, cache_key: str, result: Dict[str, Any]):
+        """
+        Store a response in cache.
+        
+        Args:
+            cache_key: Key from get_cache_key()
+            result: Result dict returned by LLMClient.call()
+        """
+        self._remember(cache_key, result, time.time())
+        
+        try:
+            # Write to a temp file and rename so readers never see a partial entry
+            with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=self.cache_dir, suffix='.tmp', delete=False) as f:
+                f.write(json.dumps(result, separators=(',', ':')))
+            os.replace(f.name, self._get_cache_path(cache_key))
+            
+        except Exception as e:
+            logger.warning(f"Failed to write LLM cache: {str(e)}")
+    
+    def _remember(self, cache_key: str, result: Dict[str, Any], stored_at: float):
+        # Entries keep their insert time so memory hits expire with the same TTL as files
+        with self._lock:
+            self._memory[cache_key] = (stored_at, result)
+            self._memory.move_to_end(cache_key)
+            while len(self._memory) > self.maxsize:
+                self._memory.popitem(last=False)
+
+
 class LLMClient:
-    def __init__(self, provider: str, model: str, api_key: str):
+    # Responses sampled above this temperature are not deterministic enough to reuse
+    CACHE_MAX_TEMPERATURE = 0.5
+    
+    def __init__(
+        self,
+        provider: str,
+        model: str,
+        api_key: str,
+        use_cache: bool = True,
+        cache_ttl_hours: int = 24,
+        max_concurrency: int = 8
+    ):
         self.provider = provider
         self.model = model
         self.api_key = api_key
         self.call_log = []
+        self.cache = LLMResponseCache(ttl_hours=cache_ttl_hours) if use_cache else None
+        self.max_concurrency = max_concurrency
+        self._semaphore = None
+        self._semaphore_loop = None
         
         if provider == "gemini":
-            import google.generativeai as genai
-            genai.configure(api_key=api_key)
+            genai = _configure_genai(api_key)
             self.client = genai.GenerativeModel(model)
 
-    def call(self, prompt: str, temperature: float = 0.3, max_tokens: int = 1000) -> Dict[str, Any]:
-        """Call LLM and log the interaction."""
+    def call(
+        self,
+        prompt: str,
+        temperature: float = 0.3,
+        max_tokens: int = 1000,
+        stop_when: Optional[Callable[[str], bool]] = None
+    ) -> Dict[str, Any]:
+        """
+        Call LLM and log the interaction. Low-temperature responses are served from cache when possible.
+        
+        If stop_when is given, the response is streamed and generation is abandoned as soon as
+        stop_when(text_so_far) returns True, so callers that only need the start of the reply
+        don't wait for the rest.
+        """
         start = time.time()
 
+        cache_key = None
+        if self.cache and temperature <= self.CACHE_MAX_TEMPERATURE:
+            cache_key = self.cache.get_cache_key(self.model, prompt, temperature, max_tokens, streamed=stop_when is not None)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                logger.debug(f"LLM cache hit for prompt of length {len(prompt)}")
+                return {**cached, "latency_ms": (time.time() - start) * 1000}
+
         try:
-            response = self.client.generate_content(
-                prompt,
-                generation_config={
-                    "temperature": temperature,
-                    "max_output_tokens": max_tokens,
-                }
-            )
+            generation_config = {
+                "temperature": temperature,
+                "max_output_tokens": max_tokens,
+            }
+            if stop_when is None:
+                response_text = self.client.generate_content(prompt, generation_config=generation_config).text
+            else:
+                response_text = ""
+                for chunk in self.client.generate_content(prompt, generation_config=generation_config, stream=True):
+                    response_text += chunk.text
+                    if stop_when(response_text):
+                        break
             result = {
-                "response": response.text,
+                "response": response_text,
                 "prompt_tokens": 0,
                 "completion_tokens": 0,
                 "total_tokens": 0,
@@ -44,11 +279,38 @@ class LLMClient:
 
             self._log_call(prompt, result)
 
+            if cache_key:
+                self.cache.set(cache_key, result)
+
             return result
         except Exception as e:
             logger.error(f"LLM call failed: {str(e)}")
             raise
 
+    async def acall(
+        self,
+        prompt: str,
+        temperature: float = 0.3,
+        max_tokens: int = 1000,
+        stop_when: Optional[Callable[[str], bool]] = None
+    ) -> Dict[str, Any]:
+        """
+        Async variant of call(); runs the blocking SDK request in a worker thread.
+        
+        At most max_concurrency calls are in flight at once across all callers
+        on the event loop, so concurrent requests share one quota.
+        """
+        async with self._get_semaphore():
+            return await asyncio.to_thread(self.call, prompt, temperature, max_tokens, stop_when)
+    
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """Return the semaphore for the running event loop (asyncio primitives are bound to one loop)."""
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphore_loop = loop
+        return self._semaphore
+
     def _log_call(self, prompt: str, result: Dict[str, Any]):
         """Log LLM calls for debugging and cost analysis."""
         log_entry = {
@@ -63,11 +325,7 @@ class LLMClient:
         
         self.call_log.append(log_entry)
         
-        # Write to file
-        log_dir = Path("./logs")
-        log_dir.mkdir(exist_ok=True)
-        
-        with open(log_dir / "llm_calls.jsonl", "a") as f:
-            f.write(json.dumps(log_entry) + "\n")
+        # Write to file (in the background, off the request path)
+        _call_log_writer.write(log_entry)
         
         logger.info(f"LLM Call: {log_entry}")
\ No newline at end of file
@@ -0,0 +1,50 @@
+import asyncio
+import time
+
+
+class AsyncTokenBucket:
+    """
+    Token-bucket rate limiter for coroutines.
+    
+    Allows bursts of up to `capacity` requests and refills at `refill_per_sec`
+    tokens per second. Callers that run out of tokens wait with asyncio.sleep,
+    so other coroutines keep running in the meantime.
+    """
+    
+    def __init__(self, capacity: float, refill_per_sec: float):
+        """
+        Initialize token bucket.
+        
+        Args:
+            capacity: Maximum number of tokens (burst size)
+            refill_per_sec: Tokens added per second (sustained rate)
+        """
+        self.capacity = capacity
+        self.refill_per_sec = refill_per_sec
+        self.tokens = capacity
+        self.last_refill = time.monotonic()
+        self._lock = None
+        self._lock_loop = None
+    
+    async def acquire(self, tokens: float = 1):
+        """Wait until `tokens` tokens are available and take them."""
+        # Waiters queue on the lock, so tokens are handed out in arrival order
+        async with self._get_lock():
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.refill_per_sec)
+                self.last_refill = now
+                
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return
+                
+                await asyncio.sleep((tokens - self.tokens) / self.refill_per_sec)
+    
+    def _get_lock(self) -> asyncio.Lock:
+        """Return the lock for the running event loop (asyncio locks are bound to one loop)."""
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._lock_loop is not loop:
+            self._lock = asyncio.Lock()
+            self._lock_loop = loop
+        return self._lock
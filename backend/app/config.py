@@ -7,6 +7,12 @@ class Settings(BaseSettings):
     gemini_api_key: Optional[str] = None
     google_factcheck_api_key: Optional[str] = None
     log_llm_calls: bool = True
+    llm_concurrency: int = 8
+    llm_cache_ttl_hours: int = 24
+    # Prompt budgets count words and punctuation marks, not model tokens, and
+    # are also capped at 4 characters per token
+    claim_extraction_max_tokens: int = 750
+    stance_evidence_max_tokens: int = 380
     
     class Config:
         env_file = ".env"
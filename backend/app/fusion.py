@@ -2,6 +2,16 @@
 import math
 from typing import Tuple
 
+# Result used instead of fusion when no claim has a fact-check cross-reference
+INSUFFICIENT_CONF = -1.0
+INSUFFICIENT_EXPLANATION = "Insufficient data: No fact-check cross-references found for any claims."
+INSUFFICIENT_VERDICT = "Insufficient data"
+INSUFFICIENT_RESULT = (INSUFFICIENT_CONF, INSUFFICIENT_EXPLANATION, INSUFFICIENT_VERDICT)
+
+W_SOURCE, W_TEXT, W_CROSS = 0.4, 0.4, 0.6
+# Default weights normalized once, instead of on every call
+_DEFAULT_WEIGHTS = tuple(w/(W_SOURCE + W_TEXT + W_CROSS) for w in (W_SOURCE, W_TEXT, W_CROSS))
+
 def logit(p: float, eps: float=1e-6) -> float:
     p = min(max(p, eps), 1-eps)
     return math.log(p/(1-p))
@@ -9,13 +19,25 @@ def logit(p: float, eps: float=1e-6) -> float:
 def sigmoid(z: float) -> float:
     return 1/(1+math.exp(-z))
 
+def _fuse(sp: float, tc: float, cr: float, ws: float, wt: float, wc: float, eps: float=1e-6) -> float:
+    # logit() and sigmoid() inlined: this runs once per (re)scored article, and
+    # in tight loops when evaluating weight settings
+    hi = 1-eps
+    sp = eps if sp < eps else hi if sp > hi else sp
+    tc = eps if tc < eps else hi if tc > hi else tc
+    cr = eps if cr < eps else hi if cr > hi else cr
+    z = ws*math.log(sp/(1-sp)) + wt*math.log(tc/(1-tc)) + wc*math.log(cr/(1-cr))
+    return 1/(1+math.exp(-z))
+
 def combine_confidence(source_prior: float, text_consistency: float, cross_reference: float,
-                       w_source: float=0.4, w_text: float=0.4, w_cross: float=0.6) -> Tuple[float,str]:
-    # Normalize weights so they sum to 1
-    s = w_source + w_text + w_cross
-    ws, wt, wc = w_source/s, w_text/s, w_cross/s
-    z = ws*logit(source_prior) + wt*logit(text_consistency) + wc*logit(cross_reference)
-    conf = sigmoid(z)
+                       w_source: float=W_SOURCE, w_text: float=W_TEXT, w_cross: float=W_CROSS) -> Tuple[float,str]:
+    if (w_source, w_text, w_cross) == (W_SOURCE, W_TEXT, W_CROSS):
+        ws, wt, wc = _DEFAULT_WEIGHTS
+    else:
+        # Normalize weights so they sum to 1
+        s = w_source + w_text + w_cross
+        ws, wt, wc = w_source/s, w_text/s, w_cross/s
+    conf = _fuse(source_prior, text_consistency, cross_reference, ws, wt, wc)
     # Simple verdict thresholds (tune as needed)
     if conf >= 0.7: verdict = "Likely true"
     elif conf >= 0.45: verdict = "Uncertain"
@@ -1,17 +1,22 @@
+from contextlib import asynccontextmanager
 from pathlib import Path
+import asyncio
 import logging
 
+import orjson
+
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, Response
 from fastapi.staticfiles import StaticFiles
 
+from sqlalchemy import event, insert
 from sqlmodel import SQLModel, Session, create_engine
 
-from .schema import AnalyzeRequest, AnalyzeResponse, ClaimOut, EvidenceOut
-from .pipeline import fetch_and_clean, extract_domain
+from .schema import AnalyzeRequest, AnalyzeResponse, EvidenceOut
+from .pipeline import fetch_and_clean, extract_domain, close_http
 from .storage import get_or_seed_source
-from .fusion import combine_confidence
+from .fusion import combine_confidence, INSUFFICIENT_RESULT
 from .models import Article, Claim, Evidence, Verification
 
 
@@ -19,11 +24,46 @@ logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
 # Database
-engine = create_engine("sqlite:///./verifier.db", echo=False)
+engine = create_engine(
+    "sqlite:///./verifier.db",
+    # Pooled connections may be checked out from worker threads, not just the loop thread
+    connect_args={"check_same_thread": False},
+    pool_pre_ping=False,
+)
+
+
+@event.listens_for(engine, "connect")
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    # WAL lets readers run alongside a writer, and with synchronous=NORMAL
+    # commits no longer fsync the whole database file. Temp tables stay in
+    # memory and reads go through a 256 MiB memory map instead of read() calls
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA mmap_size=268435456")
+    cursor.close()
+
+
 SQLModel.metadata.create_all(engine)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    from .clients.claims_client import close_clients
+    # Release pooled keep-alive connections on shutdown
+    await close_clients()
+    await close_http()
+
+
 # FastAPI app
-app = FastAPI(title="FakeNews Verifier API")
+app = FastAPI(title="FakeNews Verifier API", lifespan=lifespan)
+
+# Evidence keys included in API responses; pipeline evidence carries extra fields
+EVIDENCE_OUT_FIELDS = tuple(EvidenceOut.model_fields)
+
+# Evidence columns filled from pipeline evidence (everything but the keys)
+EVIDENCE_COLUMNS = tuple(c.name for c in Evidence.__table__.columns if c.name not in ("id", "claim_id"))
 
 # Location of frontend
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -47,97 +87,136 @@ def serve_frontend():
     return FileResponse(FRONTEND_DIR / "index.html")
 
 
-# ---------- ANALYZE ENDPOINT ----------
-@app.post("/analyze", response_model=AnalyzeResponse)
-def analyze(req: AnalyzeRequest):
-    if not req.url and not req.text:
-        raise HTTPException(400, "Provide url or text")
-
+def _load_source_prior(domain: str) -> float:
+    """Look up (or seed) the domain's prior in a short session of its own."""
     with Session(engine) as session:
-        if req.url:
-            article = fetch_and_clean(req.url)
-        else:
-            article = Article(clean_text=req.text)
-
-        article.domain = article.domain or (extract_domain(req.url) if req.url else None)
-        session.add(article)
-        session.commit()
-        session.refresh(article)
-
-        source_prior = 0.5
-        if article.domain:
-            src = get_or_seed_source(session, article.domain)
-            source_prior = src.bayes_prior_truth
-
-        from app.clients.claims_client import extract_claims_and_evidence
-        ce = extract_claims_and_evidence(article.clean_text or "")
-
-        text_consistency = float(ce.get("text_consistency", 0.5))
-        cross_reference = float(ce.get("cross_reference", 0.0))
+        return get_or_seed_source(session, domain).bayes_prior_truth
+
+
+def _persist_analysis(
+    article: Article,
+    claims: list,
+    source_prior: float,
+    text_consistency: float,
+    cross_reference: float,
+    combined: float,
+    explanation: str,
+) -> list:
+    """
+    Write the article, verification, claims and evidence in one transaction.
+
+    Returns the claims in response form. Core inserts skip the ORM unit of
+    work; RETURNING hands back the ids needed for the foreign keys.
+    """
+    with Session(engine) as session:
+        article_id = session.execute(
+            insert(Article).values(**article.model_dump(exclude={"id"})).returning(Article.id)
+        ).scalar_one()
 
-        if cross_reference == 0.0:
-            combined = -1.0
-            explanation = (
-                "Insufficient data: No fact-check cross-references found for any claims."
-            )
-            verdict = "Insufficient data"
-        else:
-            combined, explanation = combine_confidence(
-                source_prior, text_consistency, cross_reference
-            )
-            if combined >= 0.7:
-                verdict = "Likely true"
-            elif combined >= 0.45:
-                verdict = "Uncertain"
-            else:
-                verdict = "Likely misleading"
-
-        ver = Verification(
-            article_id=article.id,
+        session.execute(insert(Verification).values(
+            article_id=article_id,
             source_prior=source_prior,
             text_consistency=text_consistency,
             cross_reference=cross_reference,
             combined_confidence=combined,
             explanation=explanation,
-        )
-        session.add(ver)
-        session.commit()
+        ))
+
+        claim_ids = []
+        if claims:
+            claim_ids = session.execute(
+                insert(Claim).returning(Claim.id, sort_by_parameter_order=True),
+                [
+                    {
+                        "article_id": article_id,
+                        "text": c["text"],
+                        "start_char": c.get("start_char"),
+                        "end_char": c.get("end_char"),
+                    }
+                    for c in claims
+                ],
+            ).scalars().all()
 
         claims_out = []
-        for c in ce.get("claims", []):
-            claim_row = Claim(
-                article_id=article.id,
-                text=c["text"],
-                start_char=c.get("start_char"),
-                end_char=c.get("end_char"),
-            )
-            session.add(claim_row)
-            session.commit()
-            session.refresh(claim_row)
-
+        evidence_rows = []
+        for c, claim_id in zip(claims, claim_ids):
             ev_outs = []
             for ev in c.get("evidences", []):
-                ev_row = Evidence(claim_id=claim_row.id, **ev)
-                session.add(ev_row)
-                session.commit()
-                ev_outs.append(EvidenceOut(**ev))
-
-            claims_out.append(
-                ClaimOut(
-                    text=c["text"],
-                    start_char=c.get("start_char"),
-                    end_char=c.get("end_char"),
-                    evidences=ev_outs,
-                )
-            )
-
-        return AnalyzeResponse(
-            domain=article.domain,
-            verdict_label=verdict,
-            combined_confidence=combined,
-            explanation=explanation,
-            source_prior=source_prior,
-            text_consistency=text_consistency,
-            cross_reference=cross_reference,
-            claims=claims_out,
+                evidence_rows.append({"claim_id": claim_id, **{column: ev.get(column) for column in EVIDENCE_COLUMNS}})
+                ev_outs.append({field: ev.get(field) for field in EVIDENCE_OUT_FIELDS})
+
+            claims_out.append({
+                "text": c["text"],
+                "start_char": c.get("start_char"),
+                "end_char": c.get("end_char"),
+                "evidences": ev_outs,
+            })
+
+        # One executemany for all evidence rows
+        if evidence_rows:
+            session.execute(insert(Evidence), evidence_rows)
+        session.commit()
+
+    return claims_out
+
+
+# ---------- ANALYZE ENDPOINT ----------
+@app.post("/analyze", responses={200: {"model": AnalyzeResponse}})
+async def analyze(req: AnalyzeRequest):
+    if not req.url and not req.text:
+        raise HTTPException(400, "Provide url or text")
+
+    if req.url:
+        article = await fetch_and_clean(req.url)
+    else:
+        article = Article(clean_text=req.text)
+
+    article.domain = article.domain or (extract_domain(req.url) if req.url else None)
+
+    # Database work runs in worker threads, and no connection is held while
+    # the pipeline below is awaited
+    source_prior = 0.5
+    if article.domain:
+        source_prior = await asyncio.to_thread(_load_source_prior, article.domain)
+
+    from .clients.claims_client import extract_claims_and_evidence
+    result = await extract_claims_and_evidence(article.clean_text or "")
+    claims = result["claims"]
+    text_consistency = float(result["text_consistency"])
+    cross_reference = float(result["cross_reference"])
+
+    if cross_reference == 0.0:
+        combined, explanation, verdict = INSUFFICIENT_RESULT
+    else:
+        combined, explanation = combine_confidence(
+            source_prior, text_consistency, cross_reference
         )
+        if combined >= 0.7:
+            verdict = "Likely true"
+        elif combined >= 0.45:
+            verdict = "Uncertain"
+        else:
+            verdict = "Likely misleading"
+
+    # Persist everything in a single transaction, written only once the
+    # pipeline is done
+    claims_out = await asyncio.to_thread(
+        _persist_analysis,
+        article, claims, source_prior, text_consistency, cross_reference, combined, explanation,
+    )
+
+    # Every field comes from our own pipeline, so serialize directly
+    # instead of validating it again through AnalyzeResponse
+    return Response(
+        orjson.dumps({
+            "domain": article.domain,
+            "source_prior": source_prior,
+            "text_consistency": text_consistency,
+            "cross_reference": cross_reference,
+            "combined_confidence": combined,
+            "verdict_label": verdict,
+            "explanation": explanation,
+            "claims": claims_out,
+        }),
+        media_type="application/json",
+    )
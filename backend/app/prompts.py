@@ -43,6 +43,20 @@ Does the source text support, contradict, or neither relate to the statement?
 Respond with one word: "support", "contradict", or "neither"
 """
 
+BATCH_STANCE_PROMPT = """You are a helpful assistant that determines the stance of several claims based on provided evidence.
+
+Statements (JSON array, claim_id is the position in the array starting at 0): {claims}
+Source text: "{evidence}"
+
+For each statement, does the source text support it, refute it, or neither relate to it?
+
+Return ONLY a valid JSON array (no markdown, no explanation) with one entry per statement:
+[
+  {{"claim_id": 0, "stance": "supports|refutes|neutral"}},
+  ...
+]
+"""
+
 SIMILARITY_SCORING_PROMPT = """On a scale from 0 to 1.0, how relevant is the source text to the statement?
 
 Statement: "{claim}"
@@ -1,10 +1,31 @@
 # app/storage.py (source prior)
+import threading
+from typing import NamedTuple
+from cachetools import TTLCache
 from .models import Source
 from sqlmodel import Session, select
 
-def get_or_seed_source(session: Session, domain:str) -> Source:
+class SourcePrior(NamedTuple):
+    """Detached snapshot of a Source row, safe to share across sessions."""
+    domain: str
+    bayes_prior_truth: float
+
+# Source priors by domain; the table is read on every request but rarely written
+_SRC_CACHE: TTLCache = TTLCache(maxsize=2048, ttl=300)
+_SRC_CACHE_LOCK = threading.Lock()
+
+def get_or_seed_source(session: Session, domain:str) -> SourcePrior:
+    with _SRC_CACHE_LOCK:
+        prior = _SRC_CACHE.get(domain)
+    if prior is not None:
+        return prior
+
     src = session.exec(select(Source).where(Source.domain==domain)).first()
     if not src:
         src = Source(domain=domain, name=domain, bayes_prior_truth=0.6)
         session.add(src); session.commit()
-    return src
+    prior = SourcePrior(domain=src.domain, bayes_prior_truth=src.bayes_prior_truth)
+
+    with _SRC_CACHE_LOCK:
+        _SRC_CACHE[domain] = prior
+    return prior
@@ -0,0 +1,160 @@
+# app/tests/test_claims.py
+from backend.app.clients.claims_client import _stance_is_decided, _stance_to_score, _strip_code_fence, _truncate_to_tokens
+
+def test_stance_first_token_lookup():
+    assert _stance_to_score("Refutes.") == 0.1
+    assert _stance_to_score('"supports"') == 0.9
+
+def test_stance_accepts_words_from_the_stance_prompt():
+    assert _stance_is_decided("contradict.")
+    assert _stance_is_decided("neither ")
+    assert not _stance_is_decided("neith")
+    assert _stance_to_score("Contradict") == 0.1
+    assert _stance_to_score("contradicts.") == 0.1
+    assert _stance_to_score("Neither") == 0.5
+
+def test_stance_first_token_wins_over_later_keywords():
+    # "supports" appears later in the reply but must not shadow the leading stance
+    assert _stance_to_score("refutes - the text never supports this") == 0.1
+
+def test_stance_unknown_defaults_to_neutral():
+    assert _stance_to_score("I am not sure") == 0.5
+
+def test_strip_code_fence_extracts_json_payload():
+    assert _strip_code_fence('```json\n[{"claim": "x"}]\n```').strip() == '[{"claim": "x"}]'
+    assert _strip_code_fence('[]') == '[]'
+
+def test_truncate_to_tokens_cuts_on_token_boundary():
+    assert _truncate_to_tokens("Hello, world! This is fine.", 4) == "Hello, world!"
+    assert _truncate_to_tokens("short text", 10) == "short text"
+
+def test_truncate_to_tokens_caps_text_without_spaces():
+    assert len(_truncate_to_tokens("中文新闻内容没有空格" * 2000, 750)) == 3000
+
+def test_llm_client_is_built_once_under_concurrent_first_use(monkeypatch):
+    import threading
+    import time
+    from backend.app.clients import claims_client
+
+    built = []
+
+    def slow_client(**kwargs):
+        time.sleep(0.05)
+        built.append(kwargs)
+        return object()
+
+    monkeypatch.setattr(claims_client, "_llm_client", None)
+    monkeypatch.setattr(claims_client, "LLMClient", slow_client)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(claims_client.get_llm_client())) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(built) == 1
+    assert all(r is results[0] for r in results)
+
+def test_llm_calls_are_capped_across_concurrent_callers(monkeypatch):
+    import asyncio
+    import threading
+    import time
+    from backend.app.clients import claims_client
+    from backend.app.clients.llm_client import LLMClient
+
+    lock = threading.Lock()
+    in_flight = [0, 0]  # current, peak
+
+    def fake_call(prompt, temperature=0.3, max_tokens=1000, stop_when=None):
+        with lock:
+            in_flight[0] += 1
+            in_flight[1] = max(in_flight)
+        time.sleep(0.02)
+        with lock:
+            in_flight[0] -= 1
+        # The batched reply is not JSON, so every claim falls back to its own call
+        return {"response": "supports" if stop_when else "no json here", "latency_ms": 0.0}
+
+    client = LLMClient(provider="fake", model="fake", api_key=None, use_cache=False, max_concurrency=2)
+    client.call = fake_call
+    monkeypatch.setattr(claims_client, "_llm_client", client)
+
+    claims = [{"text": f"claim {i}"} for i in range(6)]
+
+    async def two_requests():
+        return await asyncio.gather(
+            claims_client.score_text_consistency_async(claims, "article"),
+            claims_client.score_text_consistency_async(claims, "other article"),
+        )
+
+    assert asyncio.run(two_requests()) == [0.9, 0.9]
+    assert in_flight[1] == 2
+
+class _FakeLLM:
+    """Stands in for LLMClient; `replies` maps each prompt to a response string."""
+
+    def __init__(self, replies):
+        self.replies = replies
+        self.prompts = []
+
+    async def acall(self, prompt, temperature=0.3, max_tokens=1000, stop_when=None):
+        self.prompts.append(prompt)
+        return {"response": self.replies(prompt), "latency_ms": 0.0}
+
+def test_batch_stance_falls_back_only_for_missing_claims(monkeypatch):
+    import asyncio
+    from backend.app.clients import claims_client
+
+    def replies(prompt):
+        if "several claims" in prompt:
+            # claim 1 is missing and claim 5 is out of range
+            return '```json\n[{"claim_id": 0, "stance": "refutes"}, {"claim_id": 2, "stance": "supports"}, {"claim_id": 5, "stance": "supports"}]\n```'
+        return "neutral"
+
+    llm = _FakeLLM(replies)
+    monkeypatch.setattr(claims_client, "_llm_client", llm)
+    scores = asyncio.run(claims_client._compute_text_consistency_batch_async(["a", "b", "c"], "article"))
+    assert scores == [0.1, 0.5, 0.9]
+    assert len(llm.prompts) == 2
+
+def test_duplicate_claims_are_scored_once_but_all_count(monkeypatch):
+    import asyncio
+    from backend.app.clients import claims_client
+
+    llm = _FakeLLM(lambda prompt: '[{"claim_id": 0, "stance": "supports"}, {"claim_id": 1, "stance": "refutes"}]')
+    monkeypatch.setattr(claims_client, "_llm_client", llm)
+    claims = [{"text": "Taxes rose"}, {"text": "  taxes   ROSE "}, {"text": "Crime fell"}]
+    score = asyncio.run(claims_client.score_text_consistency_async(claims, "article"))
+    assert len(llm.prompts) == 1
+    assert '"Taxes rose", "Crime fell"' in llm.prompts[0]
+    assert abs(score - (0.9 + 0.9 + 0.1) / 3) < 1e-9
+
+def test_cross_reference_fans_results_out_to_duplicates(monkeypatch):
+    import asyncio
+    from backend.app.clients import claims_client
+
+    searched = []
+
+    class FakeAdapter:
+        async def cross_reference_claims_batch(self, claims, top_k=5):
+            searched.append(claims)
+            return [[{"similarity": 0.8}], []]
+
+    monkeypatch.setattr(claims_client, "_cross_reference_adapter", FakeAdapter())
+    claims = [{"text": "Taxes rose"}, {"text": "Crime fell"}, {"text": "taxes rose"}]
+    cross_reference = asyncio.run(claims_client.cross_reference_claims_async(claims))
+    assert searched == [["Taxes rose", "Crime fell"]]
+    assert claims[0]["evidences"] == claims[2]["evidences"] == [{"similarity": 0.8}]
+    assert claims[1]["evidences"] == []
+    assert cross_reference == 0.8
+
+def test_extract_claims_locates_claims_in_text(monkeypatch):
+    import asyncio
+    from backend.app.clients import claims_client
+
+    llm = _FakeLLM(lambda prompt: '[{"claim": "taxes rose"}, {"fact": "Missing claim"}, "junk"]')
+    monkeypatch.setattr(claims_client, "_llm_client", llm)
+    claims = asyncio.run(claims_client.extract_claims_async("Last year Taxes rose sharply."))
+    assert claims == [
+        {"text": "taxes rose", "start_char": 10, "end_char": 20, "evidences": []},
+        {"text": "Missing claim", "start_char": None, "end_char": None, "evidences": []},
+    ]
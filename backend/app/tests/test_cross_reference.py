@@ -0,0 +1,115 @@
+# app/tests/test_cross_reference.py
+from backend.app.clients.google_factcheck_client import CrossReferenceAdapter, GoogleFactCheckClient
+
+def _adapter():
+    return CrossReferenceAdapter(api_key="")
+
+def test_rank_identical_claim_first_ignoring_case():
+    ranked = _adapter()._rank_by_similarity(
+        "Masks reduce transmission by 50%",
+        ["The moon landing was staged in 1969", "masks reduce transmission by 50%"],
+        top_k=5,
+    )
+    assert ranked[0] == (1, 1.0)
+
+def test_rank_drops_unrelated_and_respects_top_k():
+    ranked = _adapter()._rank_by_similarity(
+        "Masks reduce transmission by 50%",
+        ["", "Masks reduce transmission", "Masks reduce transmission by 50 percent", "Masks work"],
+        top_k=2,
+    )
+    assert len(ranked) == 2
+    assert 0 not in [index for index, _ in ranked]
+    assert ranked[0][1] >= ranked[1][1]
+
+def test_rank_skips_statements_of_very_different_length():
+    claim = "Masks reduce transmission of respiratory viruses by 50% in crowded indoor settings"
+    ranked = _adapter()._rank_by_similarity(claim, ["Masks", claim], top_k=5)
+    assert [index for index, _ in ranked] == [1]
+
+def test_rank_drops_statements_on_other_topics():
+    ranked = _adapter()._rank_by_similarity(
+        "The president is currently 52 years old",
+        [
+            "The governor signed a bill raising the minimum wage to 15 dollars",
+            "The city council voted to close the public library on Sundays",
+            "The president is 52 years old",
+        ],
+        top_k=5,
+    )
+    assert [index for index, _ in ranked] == [2]
+
+def test_rating_partial_match_prefers_longest_phrase():
+    client = GoogleFactCheckClient(api_key="", use_cache=False)
+    assert client._rating_to_score("Mostly False.") == 0.25
+    assert client._rating_to_score("Half true") == 0.5
+    assert client._rating_to_score("Pants on Fire!") == 0.0
+    assert client._rating_to_score("no idea") == 0.5
+
+def test_rating_hyphenated_does_not_fall_back_to_true_or_false():
+    client = GoogleFactCheckClient(api_key="", use_cache=False)
+    assert client._rating_to_score("Half-true") == 0.5
+    assert client._rating_to_score("Mostly-False") == 0.25
+    assert client._rating_to_score("Rated mostly-true by editors") == 0.75
+    assert client._rating_to_score("pants-fire") == 0.0
+
+def _client_with_transport(handler, tmp_path, **kwargs):
+    import httpx
+    from backend.app.clients.google_factcheck_client import ResultCache
+    from backend.app.clients.http_pool import LoopBoundAsyncClient
+
+    client = GoogleFactCheckClient(api_key="key", use_cache=False, **kwargs)
+    client.cache = ResultCache(db_path=str(tmp_path / "fact_checks.db"))
+    client._async_http = LoopBoundAsyncClient(transport=httpx.MockTransport(handler))
+    return client
+
+def _api_reply(query):
+    return {"claims": [{
+        "text": f"Checked: {query}",
+        "claimReview": [{"publisher": {"name": "Snopes"}, "url": "https://x", "textualRating": "Mostly-False"}],
+    }]}
+
+def test_search_many_caps_in_flight_requests_and_keeps_order(tmp_path):
+    import asyncio
+    import httpx
+
+    in_flight = [0, 0]  # current, peak
+
+    async def handler(request):
+        in_flight[0] += 1
+        in_flight[1] = max(in_flight)
+        await asyncio.sleep(0.01)
+        in_flight[0] -= 1
+        return httpx.Response(200, json=_api_reply(request.url.params["query"]))
+
+    client = _client_with_transport(handler, tmp_path, max_concurrency=2, rate_limit_delay=0.001, rate_limit_burst=10)
+    claims = [f"claim {i}" for i in range(6)]
+    results = asyncio.run(client.search_many(claims))
+    assert [r[0]["statement"] for r in results] == [f"Checked: {c}" for c in claims]
+    assert results[0][0]["truth_score"] == 0.25
+    assert in_flight[1] == 2
+
+def test_search_async_serves_repeats_from_cache(tmp_path):
+    import asyncio
+    import httpx
+
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(200, json=_api_reply("q"))
+
+    client = _client_with_transport(handler, tmp_path)
+    first = asyncio.run(client.search_async("Taxes rose"))
+    again = asyncio.run(client.search_async("TAXES ROSE"))
+    assert first == again
+    assert len(requests) == 1
+
+def test_search_async_returns_empty_on_http_error(tmp_path):
+    import asyncio
+    import httpx
+
+    client = _client_with_transport(lambda request: httpx.Response(500, text="boom"), tmp_path)
+    assert asyncio.run(client.search_async("Taxes rose")) == []
+    # Failures are not cached
+    assert client.cache.get(client.cache.get_cache_key("Taxes rose")) is None
@@ -8,3 +8,12 @@ def test_fusion_refuted_claims_low_confidence():
 def test_fusion_supportive_high_confidence():
     conf, _ = combine_confidence(source_prior=0.8, text_consistency=0.8, cross_reference=0.7)
     assert conf >= 0.7  # likely true
+
+def test_fusion_default_weights_match_explicit_normalization():
+    default, _ = combine_confidence(0.6, 0.7, 0.8)
+    scaled, _ = combine_confidence(0.6, 0.7, 0.8, w_source=0.8, w_text=0.8, w_cross=1.2)
+    assert abs(default - scaled) < 1e-12
+
+def test_fusion_clamps_extreme_inputs():
+    conf, _ = combine_confidence(source_prior=0.0, text_consistency=1.0, cross_reference=1.0)
+    assert 0.0 < conf < 1.0
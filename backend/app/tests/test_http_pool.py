@@ -0,0 +1,23 @@
+# app/tests/test_http_pool.py
+import asyncio
+from backend.app.clients.http_pool import LoopBoundAsyncClient, USER_AGENT
+
+def test_client_is_reused_within_a_loop():
+    pool = LoopBoundAsyncClient()
+
+    async def grab_twice():
+        return await pool.get(), await pool.get()
+
+    first, second = asyncio.run(grab_twice())
+    assert first is second
+    assert first.headers["User-Agent"] == USER_AGENT
+
+def test_new_loop_replaces_and_closes_the_old_client():
+    pool = LoopBoundAsyncClient()
+    old = asyncio.run(pool.get())
+    new = asyncio.run(pool.get())
+    assert new is not old
+    assert old.is_closed and not new.is_closed
+
+    asyncio.run(pool.aclose())
+    assert new.is_closed
@@ -0,0 +1,64 @@
+# app/tests/test_llm_client.py
+import os
+import time
+from backend.app.clients.llm_client import LLMClient, LLMResponseCache
+
+def test_cache_key_depends_on_prompt_and_generation_settings(tmp_path):
+    cache = LLMResponseCache(cache_dir=str(tmp_path))
+    key = cache.get_cache_key("m", "prompt", 0.1, 20)
+    assert key == cache.get_cache_key("m", "prompt", 0.1, 20)
+    assert len({
+        key,
+        cache.get_cache_key("m", "other prompt", 0.1, 20),
+        cache.get_cache_key("other-model", "prompt", 0.1, 20),
+        cache.get_cache_key("m", "prompt", 0.2, 20),
+        cache.get_cache_key("m", "prompt", 0.1, 50),
+        cache.get_cache_key("m", "prompt", 0.1, 20, streamed=True),
+    }) == 6
+
+def test_cache_reads_back_across_instances_until_ttl(tmp_path):
+    key = "k"
+    LLMResponseCache(cache_dir=str(tmp_path)).set(key, {"response": "supports"})
+    cache = LLMResponseCache(cache_dir=str(tmp_path), ttl_hours=1)
+    assert cache.get(key) == {"response": "supports"}
+
+    # Expiry is by file mtime; a fresh instance has an empty in-memory LRU
+    path = tmp_path / f"{key}.json"
+    old = time.time() - 2 * 3600
+    os.utime(path, (old, old))
+    assert LLMResponseCache(cache_dir=str(tmp_path), ttl_hours=1).get(key) is None
+    assert not path.exists()
+
+def test_memory_hits_expire_after_ttl(tmp_path, monkeypatch):
+    cache = LLMResponseCache(cache_dir=str(tmp_path), ttl_hours=1)
+    cache.set("k", {"response": "supports"})
+    assert cache.get("k") == {"response": "supports"}
+
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 2 * 3600)
+    assert cache.get("k") is None
+    assert "k" not in cache._memory
+
+def test_memory_lru_is_bounded(tmp_path):
+    cache = LLMResponseCache(cache_dir=str(tmp_path), maxsize=2)
+    for key in ("a", "b", "c"):
+        cache.set(key, {"response": key})
+    assert list(cache._memory) == ["b", "c"]
+
+def test_client_serves_low_temperature_repeats_from_cache(tmp_path):
+    client = LLMClient(provider="fake", model="m", api_key=None, use_cache=False)
+    client.cache = LLMResponseCache(cache_dir=str(tmp_path))
+    calls = []
+
+    class FakeModel:
+        def generate_content(self, prompt, generation_config, stream=False):
+            calls.append(prompt)
+            return type("Reply", (), {"text": "supports"})()
+
+    client.client = FakeModel()
+    client._log_call = lambda prompt, result: None
+    assert client.call("p", temperature=0.1)["response"] == "supports"
+    assert client.call("p", temperature=0.1)["response"] == "supports"
+    client.call("p", temperature=0.9)
+    client.call("p", temperature=0.9)
+    assert len(calls) == 3
@@ -0,0 +1,27 @@
+# app/tests/test_pipeline.py
+import asyncio
+import httpx
+from backend.app import pipeline
+from backend.app.clients.http_pool import LoopBoundAsyncClient
+
+PAGE = b"<html><body><article><p>" + b"Masks reduce transmission in crowded indoor settings. " * 20 + b"</p></article></body></html>"
+
+def _serve(monkeypatch, content_type, body=PAGE):
+    def handler(request):
+        return httpx.Response(200, headers={"content-type": content_type}, content=body)
+    monkeypatch.setattr(pipeline, "_http", LoopBoundAsyncClient(transport=httpx.MockTransport(handler)))
+
+def test_fetch_extracts_html_pages(monkeypatch):
+    _serve(monkeypatch, "text/html; charset=utf-8")
+    article = asyncio.run(pipeline.fetch_and_clean("https://news.example.com/a"))
+    assert "Masks reduce transmission" in article.clean_text
+    assert article.domain == "example.com"
+
+def test_fetch_skips_non_html_responses(monkeypatch):
+    _serve(monkeypatch, "application/pdf")
+    assert asyncio.run(pipeline.fetch_and_clean("https://news.example.com/a.pdf")).clean_text is None
+
+def test_fetch_skips_pages_over_the_size_limit(monkeypatch):
+    _serve(monkeypatch, "text/html")
+    monkeypatch.setattr(pipeline, "_MAX_DOWNLOAD_BYTES", len(PAGE) - 1)
+    assert asyncio.run(pipeline.fetch_and_clean("https://news.example.com/a")).clean_text is None
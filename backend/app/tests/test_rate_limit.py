@@ -0,0 +1,21 @@
+# app/tests/test_rate_limit.py
+import asyncio
+import time
+from backend.app.clients.rate_limit import AsyncTokenBucket
+
+def test_bucket_allows_burst_then_paces():
+    bucket = AsyncTokenBucket(capacity=3, refill_per_sec=20)
+
+    async def take(n):
+        start = time.monotonic()
+        for _ in range(n):
+            await bucket.acquire()
+        return time.monotonic() - start
+
+    assert asyncio.run(take(3)) < 0.04  # the burst is free
+    assert asyncio.run(take(2)) >= 0.08  # then one token every 50 ms
+
+def test_bucket_works_across_event_loops():
+    bucket = AsyncTokenBucket(capacity=1, refill_per_sec=100)
+    asyncio.run(bucket.acquire())
+    asyncio.run(bucket.acquire())  # would fail if the lock stayed bound to the first loop
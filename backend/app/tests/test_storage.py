@@ -0,0 +1,34 @@
+# app/tests/test_storage.py
+from sqlalchemy import event
+from sqlalchemy.pool import StaticPool
+from sqlmodel import SQLModel, Session, create_engine
+from backend.app import storage
+from backend.app.models import Source
+
+def _engine():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    SQLModel.metadata.create_all(engine)
+    return engine
+
+def test_source_prior_is_seeded_once_then_cached(monkeypatch):
+    monkeypatch.setattr(storage, "_SRC_CACHE", type(storage._SRC_CACHE)(maxsize=16, ttl=300))
+    engine = _engine()
+    queries = []
+    event.listen(engine, "before_cursor_execute", lambda *args: queries.append(args[2]))
+
+    with Session(engine) as session:
+        seeded = storage.get_or_seed_source(session, "example.com")
+    assert seeded == ("example.com", 0.6)
+
+    queries.clear()
+    with Session(engine) as session:
+        assert storage.get_or_seed_source(session, "example.com") is seeded
+    assert queries == []
+
+def test_source_prior_reads_existing_row(monkeypatch):
+    monkeypatch.setattr(storage, "_SRC_CACHE", type(storage._SRC_CACHE)(maxsize=16, ttl=300))
+    engine = _engine()
+    with Session(engine) as session:
+        session.add(Source(domain="reuters.com", bayes_prior_truth=0.9))
+        session.commit()
+        assert storage.get_or_seed_source(session, "reuters.com").bayes_prior_truth == 0.9